@@ -9,6 +9,9 @@ import frappe
 from frappe import _
 from frappe.utils import flt
 
+# (level, route key) for each approval level; shared by every route walker in the app.
+ROUTE_LEVELS = ((1, "level_1"), (2, "level_2"), (3, "level_3"))
+
 
 def _normalize_accounts(accounts: str | Iterable[str]) -> tuple[str, ...]:
     """Normalize accounts to tuple."""
@@ -231,6 +234,43 @@ def log_route_resolution_error(exc: Exception, *, cost_center: str | None = None
         except Exception:
             pass
 
+def classify_route_users(route: dict) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    """Return ``(missing, disabled)`` lists of ``(level, user)`` for the route's approvers.
+
+    Every approver is read with a single User query. Names are matched
+    case-insensitively, as the database lookup by name is.
+    """
+    pairs = []
+    for level, level_key in ROUTE_LEVELS:
+        level_data = route.get(level_key)
+        if not isinstance(level_data, dict):
+            continue
+
+        user = level_data.get("user")
+        if user:
+            pairs.append((level, user))
+
+    if not pairs:
+        return [], []
+
+    rows = frappe.get_all(
+        "User",
+        filters={"name": ["in", list({user for _level, user in pairs})]},
+        fields=["name", "enabled"],
+    )
+    enabled_by_user = {str(row.get("name")).lower(): row.get("enabled") for row in rows}
+
+    missing = []
+    disabled = []
+    for level, user in pairs:
+        key = str(user).lower()
+        if key not in enabled_by_user:
+            missing.append((level, user))
+        elif not enabled_by_user[key]:
+            disabled.append((level, user))
+    return missing, disabled
+
+
 def validate_route_users(route: dict) -> dict:
     """Validate users in route exist and are enabled.
 
@@ -247,32 +287,19 @@ def validate_route_users(route: dict) -> dict:
     if not route:
         return {"valid": True, "invalid_users": [], "disabled_users": []}
 
-    for level in (1, 2, 3):
-        level_data = route.get(f"level_{level}", {})
-        if not isinstance(level_data, dict):
-            continue
-
-        user = level_data.get("user")
-        if not user:
-            continue
-
-        # Check if user exists
-        if not frappe.db.exists("User", user):
-            invalid_users.append({
-                "level": level,
-                "user": user,
-                "reason": "not_found",
-            })
-            continue
-
-        # Check if user is enabled
-        is_enabled = frappe.db.get_value("User", user, "enabled")
-        if not is_enabled:
-            disabled_users.append({
-                "level": level,
-                "user": user,
-                "reason": "disabled",
-            })
+    missing, disabled = classify_route_users(route)
+    for level, user in missing:
+        invalid_users.append({
+            "level": level,
+            "user": user,
+            "reason": "not_found",
+        })
+    for level, user in disabled:
+        disabled_users.append({
+            "level": level,
+            "user": user,
+            "reason": "disabled",
+        })
     return {
         "valid": not invalid_users and not disabled_users,
         "invalid_users": invalid_users,
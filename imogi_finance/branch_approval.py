@@ -8,6 +8,8 @@ import frappe
 from frappe import _
 from frappe.utils import flt
 
+from imogi_finance.approval import classify_route_users
+
 
 def _normalize_accounts(accounts: str | Iterable[str]) -> tuple[str, ...]:
     """Normalize accounts to tuple."""
@@ -209,24 +211,9 @@ def log_branch_route_resolution_error(exc: Exception, *, branch: str | None = No
 
 def validate_route_users(route: dict) -> dict:
     """Validate users in approval route exist and are enabled."""
-    invalid_users = []
-    disabled_users = []
-
-    for level in (1, 2, 3):
-        level_data = route.get(f"level_{level}", {})
-        user = level_data.get("user")
-
-        if not user:
-            continue
-
-        user_doc = frappe.db.get_value("User", user, ["enabled"], as_dict=True)
-
-        if not user_doc:
-            invalid_users.append({"level": level, "user": user})
-            continue
-
-        if not user_doc.get("enabled"):
-            disabled_users.append({"level": level, "user": user})
+    missing, disabled = classify_route_users(route)
+    invalid_users = [{"level": level, "user": user} for level, user in missing]
+    disabled_users = [{"level": level, "user": user} for level, user in disabled]
 
     return {
         "valid": not (invalid_users or disabled_users),
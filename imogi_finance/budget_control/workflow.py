@@ -310,6 +310,18 @@ def _get_entries_for_ref(ref_doctype: str, ref_name: str, entry_type: str | None
         return []
 
 
+def _has_entries_for_ref(ref_doctype: str, ref_name: str, entry_type: str | None = None) -> bool:
+    """Existence probe for submitted entries; avoids fetching rows that are never read."""
+    filters = {"ref_doctype": ref_doctype, "ref_name": ref_name, "docstatus": 1}
+    if entry_type:
+        filters["entry_type"] = entry_type
+
+    try:
+        return bool(frappe.db.exists("Budget Control Entry", filters))
+    except Exception:
+        return False
+
+
 def _reverse_reservations(expense_request):
     reservations = _get_entries_for_ref("Expense Request", getattr(expense_request, "name", None), "RESERVATION")
     if not reservations:
@@ -361,8 +373,7 @@ def reserve_budget_for_request(expense_request, *, trigger_action: str | None =
         return
 
     # Check if already reserved (avoid duplicate)
-    existing = _get_entries_for_ref("Expense Request", getattr(expense_request, "name", None), "RESERVATION")
-    if existing:
+    if _has_entries_for_ref("Expense Request", getattr(expense_request, "name", None), "RESERVATION"):
         frappe.logger().info(f"reserve_budget_for_request: Budget already reserved for {getattr(expense_request, 'name', 'Unknown')}")
         frappe.msgprint(
             _("Budget already reserved for this request."),
@@ -617,8 +628,7 @@ def handle_expense_request_workflow(expense_request, action: str | None, next_st
     
     if next_state == target_state or workflow_state == target_state or status == target_state:
         # Check if already reserved
-        existing = _get_entries_for_ref("Expense Request", getattr(expense_request, "name", None), "RESERVATION")
-        if existing:
+        if _has_entries_for_ref("Expense Request", getattr(expense_request, "name", None), "RESERVATION"):
             # Already reserved, just update status
             frappe.logger().info(f"handle_expense_request_workflow: Budget already reserved for {getattr(expense_request, 'name', None)}, updating to Approved")
             if hasattr(expense_request, "db_set"):
@@ -10,6 +10,7 @@ from frappe.model.document import Document
 from frappe.utils import getdate, now_datetime
 
 from imogi_finance.branching import apply_branch, doc_supports_branch, resolve_branch
+from imogi_finance.services.doc_cache import get_doc_cache
 from imogi_finance.tax_operations import validate_tax_period_lock
 from .payment_service import ensure_payment_entry
 
@@ -32,6 +33,24 @@ DEFAULT_APV_SETTINGS = {
     "posting_requires_accounts_manager": 0,
 }
 
+_VALID_WORKFLOW_STATES = frozenset({"Draft", "Pending Approval", "Approved", "Posted", "Rejected", "Cancelled"})
+# States whose vouchers are locked against edits.
+_IMMUTABLE_STATES = frozenset({"Approved", "Posted"})
+# States in which a voucher may be posted to a Payment Entry.
+_PAYMENT_ENTRY_STATES = frozenset({"Approved", "Posted"})
+# System and workflow columns that may change on a locked voucher.
+_EDIT_LOCK_IGNORED_FIELDS = frozenset(
+    {"modified", "modified_by", "status", "workflow_state", "_comments", "_assign", "_liked_by"}
+)
+_INDICATOR_COLORS = {
+    "Draft": "gray",
+    "Pending Approval": "blue",
+    "Approved": "green",
+    "Posted": "green",
+    "Rejected": "red",
+    "Cancelled": "red",
+}
+
 
 def resolve_fiscal_year(posting_date, company: str) -> frappe._dict:
     for path in ("erpnext.accounts.utils.get_fiscal_year", "frappe.utils.get_fiscal_year"):
@@ -374,8 +393,11 @@ class AdministrativePaymentVoucher(Document):
         if not previous:
             return
 
-        immutable_states = {"Approved", "Posted"}
-        if previous.docstatus == 1 or previous.status in immutable_states or previous.workflow_state in immutable_states:
+        if (
+            previous.docstatus == 1
+            or previous.status in _IMMUTABLE_STATES
+            or previous.workflow_state in _IMMUTABLE_STATES
+        ):
             flags_obj = getattr(self, "flags", None)
             if flags_obj and getattr(flags_obj, "workflow_action_allowed", False):
                 return
@@ -390,22 +412,14 @@ class AdministrativePaymentVoucher(Document):
                 )
 
     def _get_changed_fields(self, previous: Document) -> set[str]:
-        changed: set[str] = set()
-        ignore_fields = {
-            "modified",
-            "modified_by",
-            "status",
-            "workflow_state",
-            "_comments",
-            "_assign",
-            "_liked_by",
-        }
-        for field in self.meta.get_valid_columns():
-            if field in ignore_fields:
-                continue
-            if getattr(self, field, None) != getattr(previous, field, None):
-                changed.add(field)
-        return changed
+        fields = [field for field in self.meta.get_valid_columns() if field not in _EDIT_LOCK_IGNORED_FIELDS]
+        current_values = getattr(self, "__dict__", None)
+        previous_values = getattr(previous, "__dict__", None)
+        if current_values is None or previous_values is None:
+            return {field for field in fields if getattr(self, field, None) != getattr(previous, field, None)}
+
+        # Document field values live in __dict__ (what Document.get reads); compare them directly.
+        return {field for field in fields if current_values.get(field) != previous_values.get(field)}
 
     def _apply_reason_attachment_policy(self):
         settings = get_apv_settings()
@@ -448,8 +462,7 @@ class AdministrativePaymentVoucher(Document):
         if not workflow_state:
             return
 
-        valid_states = {"Draft", "Pending Approval", "Approved", "Posted", "Rejected", "Cancelled"}
-        if workflow_state not in valid_states:
+        if workflow_state not in _VALID_WORKFLOW_STATES:
             return
 
         if self.status == workflow_state:
@@ -466,34 +479,41 @@ class AdministrativePaymentVoucher(Document):
         if self.docstatus != 1 and not allow_draft and not getattr(self.flags, "allow_payment_entry_in_workflow", False):
             frappe.throw(_("Payment Entry can only be created from a submitted voucher."))
 
-        if self.workflow_state not in {"Approved", "Posted"}:
+        if self.workflow_state not in _PAYMENT_ENTRY_STATES:
             frappe.throw(
                 _("Payment Entry can only be created when the voucher is Approved."),
                 title=_("Not Allowed"),
             )
 
         settings = get_apv_settings()
-        roles_for_session = frappe.get_roles() if hasattr(frappe, "get_roles") else []
-        if settings.posting_requires_accounts_manager and roles.ACCOUNTS_MANAGER not in roles_for_session:
+        if settings.posting_requires_accounts_manager and roles.ACCOUNTS_MANAGER not in self._session_roles():
             frappe.throw(_("Only Accounts Managers can post Administrative Payment Vouchers."))
 
     def _assert_can_post(self):
-        if self.workflow_state not in {"Approved", "Posted"} and self.status not in {"Approved", "Posted"}:
+        if self.workflow_state not in _PAYMENT_ENTRY_STATES and self.status not in _PAYMENT_ENTRY_STATES:
             frappe.throw(_("Voucher must be Approved before posting."))
         settings = get_apv_settings()
-        roles_for_session = frappe.get_roles() if hasattr(frappe, "get_roles") else []
-        if settings.posting_requires_accounts_manager and roles.ACCOUNTS_MANAGER not in roles_for_session:
+        if settings.posting_requires_accounts_manager and roles.ACCOUNTS_MANAGER not in self._session_roles():
             frappe.throw(_("Only Accounts Managers can post Administrative Payment Vouchers."))
 
     def _assert_can_cancel(self):
-        roles_for_session = frappe.get_roles() if hasattr(frappe, "get_roles") else []
-        if roles.ACCOUNTS_MANAGER not in roles_for_session:
+        if roles.ACCOUNTS_MANAGER not in self._session_roles():
             frappe.throw(_("Only Accounts Managers can cancel a posted Administrative Payment Voucher."))
 
+    def _session_roles(self) -> frozenset[str]:
+        """Session roles, fetched once per voucher instance (Post checks them up to three times)."""
+        cache = get_doc_cache(self)
+        roles_for_session = cache.get("session_roles")
+        if roles_for_session is None:
+            roles_for_session = cache["session_roles"] = frozenset(
+                frappe.get_roles() if hasattr(frappe, "get_roles") else ()
+            )
+        return roles_for_session
+
     def _allow_workflow_action(self, *, allow_payment_entry: bool = False):
         flags = getattr(self, "flags", None)
         if flags is None:
-            flags = type("Flags", (), {})()
+            flags = frappe._dict()
             self.flags = flags
         self.flags.workflow_action_allowed = True
         if allow_payment_entry:
@@ -566,15 +586,7 @@ class AdministrativePaymentVoucher(Document):
 
     def get_indicator(self):
         state = getattr(self, "workflow_state", None) or self.status
-        colors = {
-            "Draft": "gray",
-            "Pending Approval": "blue",
-            "Approved": "green",
-            "Posted": "green",
-            "Rejected": "red",
-            "Cancelled": "red",
-        }
-        return (state, colors.get(state, "gray"), "")
+        return (state, _INDICATOR_COLORS.get(state, "gray"), "")
 
     def _add_timeline_comment(self, content: str, *, reference_doctype: Optional[str] = None, reference_name=None):
         try:
@@ -10,6 +10,7 @@ from frappe.model.document import Document
 from frappe.utils import flt, get_first_day, get_last_day, nowdate, now_datetime
 
 from imogi_finance import accounting, roles
+from imogi_finance.approval import ROUTE_LEVELS
 from imogi_finance.branching import apply_branch, resolve_branch
 from imogi_finance.branch_approval import (
     branch_approval_setting_required_message,
@@ -19,6 +20,7 @@ from imogi_finance.branch_approval import (
 )
 from imogi_finance.budget_control import ledger, service
 from imogi_finance.services.deferred_expense import generate_amortization_schedule
+from imogi_finance.services.doc_cache import get_doc_cache
 from ..expense_deferred_settings.expense_deferred_settings import get_deferrable_account_map
 from imogi_finance.tax_invoice_ocr import sync_tax_invoice_upload, validate_tax_invoice_upload_link
 from imogi_finance.validators.finance_validator import FinanceValidator
@@ -45,6 +47,12 @@ def resolve_fiscal_year(posting_date, company: str | None):
     return None
 
 
+# Route key and role/user fields for each approval level, resolved once at import.
+_LEVEL_FIELDS = {
+    level: (level_key, f"{level_key}_role", f"{level_key}_user") for level, level_key in ROUTE_LEVELS
+}
+
+
 class BranchExpenseRequest(Document):
     STATUS_DRAFT = "Draft"
     STATUS_PENDING = "Pending Review"
@@ -69,6 +77,8 @@ class BranchExpenseRequest(Document):
         self._validate_employee_requirement(settings)
         self._validate_items(settings)
         self.validate_amounts()
+        # before_submit follows in the same submit; let it reuse these totals.
+        get_doc_cache(self)["amounts_validated"] = True
         self._sync_tax_invoice_upload()
         self.validate_tax_fields()
         self._validate_deferred_expense()
@@ -81,7 +91,8 @@ class BranchExpenseRequest(Document):
     def before_submit(self):
         settings = get_settings()
         self._validate_items(settings)
-        self.validate_amounts()
+        if not get_doc_cache(self).pop("amounts_validated", False):
+            self.validate_amounts()
         self.apply_branch_defaults()
         self.validate_tax_fields()
         
@@ -118,7 +129,7 @@ class BranchExpenseRequest(Document):
         # Set workflow_action_allowed flag for ERPNext v15+ compatibility
         flags = getattr(self, "flags", None)
         if flags is None:
-            flags = type("Flags", (), {})()
+            flags = frappe._dict()
             self.flags = flags
         self.flags.workflow_action_allowed = True
         self._set_pending_review(level=initial_level)
@@ -183,8 +194,7 @@ class BranchExpenseRequest(Document):
         # Get current level - defaults to 1 for first approval
         current_level = self.get_current_level_key()
 
-        role_field = f"level_{current_level}_role"
-        user_field = f"level_{current_level}_user"
+        _level_key, role_field, user_field = _LEVEL_FIELDS[current_level]
         expected_role = self.get(role_field)
         expected_user = self.get(user_field)
 
@@ -198,8 +208,9 @@ class BranchExpenseRequest(Document):
                 )
             return
 
-        role_allowed = not expected_role or expected_role in frappe.get_roles()
+        # Compare the session user first; fetch roles only when the user check passes.
         user_allowed = not expected_user or expected_user == frappe.session.user
+        role_allowed = user_allowed and (not expected_role or expected_role in frappe.get_roles())
 
         if role_allowed and user_allowed:
             self.validate_not_skipping_levels(action, kwargs.get("next_state"))
@@ -413,7 +424,7 @@ class BranchExpenseRequest(Document):
             )
             flags = getattr(item, "flags", None)
             if flags is None:
-                flags = type("Flags", (), {})()
+                flags = frappe._dict()
                 item.flags = flags
             item.flags.deferred_amortization_schedule = schedule
 
@@ -652,27 +663,26 @@ class BranchExpenseRequest(Document):
 
     def _resolve_approval_route(self) -> tuple[dict, dict | None, bool]:
         """Resolve approval route. Returns empty route for auto-approve if not configured."""
+        accounts = self._get_expense_accounts()
         try:
             setting_meta = get_active_setting_meta_for_branch(self.branch)
             route_result = get_branch_approval_route(
-                self.branch, self._get_expense_accounts(), self.amount, setting_meta=setting_meta
+                self.branch, accounts, self.amount, setting_meta=setting_meta
             )
             route = route_result if isinstance(route_result, dict) else {}
         except (frappe.DoesNotExistError, frappe.ValidationError) as exc:
             log_branch_route_resolution_error(
                 exc,
                 branch=self.branch,
-                accounts=self._get_expense_accounts(),
+                accounts=accounts,
                 amount=self.amount,
             )
             route = {}
             setting_meta = None
 
-        has_approvers = any([
-            route.get("level_1", {}).get("user"),
-            route.get("level_2", {}).get("user"),
-            route.get("level_3", {}).get("user"),
-        ])
+        has_approvers = any(
+            (route.get(level_key) or {}).get("user") for _level, level_key in ROUTE_LEVELS
+        )
 
         skip = not has_approvers
         return route, setting_meta, skip
@@ -689,13 +699,10 @@ class BranchExpenseRequest(Document):
         if setting_meta:
             self.approval_setting = setting_meta.get("name")
 
-        for level in (1, 2, 3):
-            level_data = route.get(f"level_{level}", {})
-            user = level_data.get("user")
-            role = level_data.get("role")
-
-            setattr(self, f"level_{level}_user", user or None)
-            setattr(self, f"level_{level}_role", role or None)
+        for level_key, role_field, user_field in _LEVEL_FIELDS.values():
+            level_data = route.get(level_key, {})
+            setattr(self, user_field, level_data.get("user") or None)
+            setattr(self, role_field, level_data.get("role") or None)
 
     def _ensure_route_ready(self, route: dict):
         """Validate route is ready for submission."""
@@ -717,9 +724,10 @@ class BranchExpenseRequest(Document):
     def _get_initial_approval_level(self, route: dict | None = None) -> int:
         """Get initial approval level."""
         route = route or self.get_route_snapshot()
-        for level in (1, 2, 3):
-            target = route.get(f"level_{level}", {}) if isinstance(route, dict) else {}
-            if target.get("user"):
+        if not isinstance(route, dict):
+            return 1
+        for level, level_key in ROUTE_LEVELS:
+            if route.get(level_key, {}).get("user"):
                 return level
         return 1
 
@@ -730,12 +738,13 @@ class BranchExpenseRequest(Document):
             or getattr(self, "workflow_state", None) == self.PENDING_REVIEW_STATE
         )
 
+    def _get_configured_levels(self) -> tuple[int, ...]:
+        """Levels that currently have an approver user."""
+        return tuple(level for level, (_key, _role, user_field) in _LEVEL_FIELDS.items() if self.get(user_field))
+
     def _level_configured(self, level: int) -> bool:
         """Check if approval level is configured."""
-        if level not in {1, 2, 3}:
-            return False
-        user = self.get(f"level_{level}_user")
-        return bool(user)
+        return 1 <= level <= 3 and bool(self.get(_LEVEL_FIELDS[level][2]))
 
     def has_next_approval_level(self) -> bool:
         """Check if there is a next approval level."""
@@ -760,34 +769,26 @@ class BranchExpenseRequest(Document):
         return 1
 
     def validate_not_skipping_levels(self, action: str, next_state: str | None):
-        """Validate that approval is not skipping levels."""
-        if action != "Approve":
+        """Validate that a final approval is not skipping configured levels."""
+        # Only a final approval can skip levels; check the cheap arguments before reading fields.
+        if action != "Approve" or next_state != "Approved":
             return
 
         current = getattr(self, "current_approval_level", 0) or 0
         if current == 0:
             return
 
-        # Check if we're at the right level
-        if next_state == "Approved":
-            # Final approval - check no more levels configured
-            for level in range(current + 1, 4):
-                if self._level_configured(level):
-                    frappe.throw(
-                        _("Cannot skip approval level {0}. Please complete all configured approval levels.").format(
-                            level
-                        )
-                    )
+        skipped = next((level for level in self._get_configured_levels() if level > current), None)
+        if skipped:
+            frappe.throw(
+                _("Cannot skip approval level {0}. Please complete all configured approval levels.").format(
+                    skipped
+                )
+            )
 
     def validate_initial_approver(self, route: dict):
         """Ensure the approval route has at least one configured user."""
-        has_user = any([
-            route.get("level_1", {}).get("user"),
-            route.get("level_2", {}).get("user"),
-            route.get("level_3", {}).get("user"),
-        ])
-
-        if not has_user:
+        if not any(route.get(level_key, {}).get("user") for _level, level_key in ROUTE_LEVELS):
             frappe.throw(
                 _("Approval route must have at least one configured approver."),
                 title=_("Invalid Approval Route"),
@@ -867,6 +868,12 @@ class BranchExpenseRequest(Document):
 
     def _get_expense_accounts(self) -> tuple[str, ...]:
         """Get expense accounts from items."""
+        # validate_amounts already summarised the items in this save; reuse its account tuple.
+        # A document loaded from the database holds the Small Text column instead, so rescan that.
+        summarised = getattr(self, "expense_accounts", None)
+        if isinstance(summarised, tuple):
+            return summarised
+
         accounts = set()
         for item in self.get("items") or []:
             account = getattr(item, "expense_account", None)
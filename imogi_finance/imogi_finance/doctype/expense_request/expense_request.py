@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import operator
 from datetime import datetime
 
 import frappe
@@ -11,16 +12,43 @@ from frappe.utils import flt, now_datetime
 
 from imogi_finance import accounting, roles
 from imogi_finance.branching import apply_branch, resolve_branch
-from imogi_finance.approval import get_active_setting_meta, approval_setting_required_message
+from imogi_finance.approval import ROUTE_LEVELS, get_active_setting_meta, approval_setting_required_message
 from imogi_finance.budget_control.workflow import handle_expense_request_workflow, release_budget_for_request
 from imogi_finance.services.approval_route_service import ApprovalRouteService
 from imogi_finance.services.approval_service import ApprovalService
 from imogi_finance.services.deferred_expense import generate_amortization_schedule
+from imogi_finance.services.doc_cache import get_doc_cache
 from ..expense_deferred_settings.expense_deferred_settings import get_deferrable_account_map
 from imogi_finance.tax_invoice_ocr import sync_tax_invoice_upload, validate_tax_invoice_upload_link
 from imogi_finance.tax_invoice_fields import get_upload_link_field
 from imogi_finance.validators.finance_validator import FinanceValidator
 
+# Roles allowed to submit on behalf of the creator and to cancel a request.
+APPROVER_ROLES = frozenset({roles.SYSTEM_MANAGER, roles.EXPENSE_APPROVER})
+
+# Statuses after which key fields are frozen.
+FINAL_STATUSES = frozenset({"Approved", "PI Created", "Paid"})
+# Statuses cleared when a request is duplicated into a new draft.
+_COPY_RESET_STATUSES = frozenset({"Rejected", "Approved"})
+# Approval state cleared on a draft copied from a decided request.
+_RESET_COPY_FIELDS = {
+    "status": None,
+    "workflow_state": None,
+    "current_approval_level": 0,
+    "approved_on": None,
+    "rejected_on": None,
+    "approval_route_snapshot": None,
+    "level_1_user": None,
+    "level_2_user": None,
+    "level_3_user": None,
+}
+# Workflow actions that must be mirrored into budget control.
+_BUDGET_SYNC_ACTIONS = frozenset({"Approve", "Reject", "Reopen"})
+
+# Fields that cannot change once a request reaches a final state.
+_FINAL_STATE_KEY_FIELDS = ("request_type", "supplier", "amount", "cost_center", "branch", "project")
+_FINAL_STATE_KEY_GETTER = operator.attrgetter(*_FINAL_STATE_KEY_FIELDS)
+
 
 def _resolve_pph_rate(pph_type: str | None) -> float:
     if not pph_type:
@@ -108,6 +136,8 @@ class ExpenseRequest(Document):
 
     def before_validate(self):
         self.validate_amounts()
+        # validate() runs next in the same save; let it reuse these totals.
+        get_doc_cache(self)["amounts_validated"] = True
 
     def before_insert(self):
         self._set_requester_to_creator()
@@ -123,7 +153,8 @@ class ExpenseRequest(Document):
         """All business rule validation."""
         self._set_requester_to_creator()
         self._initialize_status()
-        self.validate_amounts()
+        if not get_doc_cache(self).pop("amounts_validated", False):
+            self.validate_amounts()
         self.apply_branch_defaults()
         self._sync_tax_invoice_upload()
         self.validate_tax_fields()
@@ -181,7 +212,8 @@ class ExpenseRequest(Document):
     def before_workflow_action(self, action, **kwargs):
         """Gate workflow actions using ApprovalService + route validation."""
         approval_service = ApprovalService("Expense Request", state_field="workflow_state")
-        route = self._get_route_snapshot()
+        # Only Submit consumes the route; Approve/Reject are checked against the level fields.
+        route = self._get_route_snapshot() if action == "Submit" else None
         approval_service.before_workflow_action(self, action, next_state=kwargs.get("next_state"), route=route)
 
     def on_workflow_action(self, action, **kwargs):
@@ -191,7 +223,7 @@ class ExpenseRequest(Document):
         approval_service.on_workflow_action(self, action, next_state=next_state)
 
         # Post-action: sync related systems
-        if action in ("Approve", "Reject", "Reopen"):
+        if action in _BUDGET_SYNC_ACTIONS:
             try:
                 # Pass next_state from kwargs, not the already-changed workflow_state
                 handle_expense_request_workflow(self, action, next_state)
@@ -225,9 +257,7 @@ class ExpenseRequest(Document):
         If manual cancellation is needed, user should cancel in reverse order:
         Payment Entry → Purchase Invoice → Expense Request
         """
-        allowed_roles = {roles.SYSTEM_MANAGER, roles.EXPENSE_APPROVER}
-        current_roles = set(frappe.get_roles())
-        if not (current_roles & allowed_roles):
+        if not self._has_any_role(APPROVER_ROLES):
             frappe.throw(_("Only System Manager or Expense Approver can cancel."), title=_("Not Allowed"))
 
     def on_cancel(self):
@@ -278,25 +308,25 @@ class ExpenseRequest(Document):
 
     def validate_amounts(self):
         """Sum item amounts and set total."""
-        total, expense_accounts = FinanceValidator.validate_amounts(self.get("items"))
+        total, expense_accounts, item_pph_total = FinanceValidator.summarize_items(self.get("items"))
         self.amount = total
         self.expense_accounts = expense_accounts
         self.expense_account = expense_accounts[0] if len(expense_accounts) == 1 else None
-        self._set_totals()
+        self._set_totals(item_pph_total)
 
-    def _set_totals(self):
-        """Calculate and set all total fields."""
-        items = self.get("items") or []
+    def _set_totals(self, item_pph_total: float | None = None):
+        """Calculate and set all total fields.
+
+        ``item_pph_total`` is the item PPh base sum when the caller has already walked the items.
+        """
+        if item_pph_total is None:
+            _, _, item_pph_total = FinanceValidator.summarize_items(self.get("items"))
+        header_pph = getattr(self, "is_pph_applicable", 0)
         total_expense = flt(getattr(self, "amount", 0) or 0)
         total_ppn = flt(getattr(self, "ti_fp_ppn", None) or getattr(self, "ppn", None) or 0)
         total_ppnbm = flt(getattr(self, "ti_fp_ppnbm", None) or getattr(self, "ppnbm", None) or 0)
-        item_pph_total = sum(
-            flt(getattr(item, "pph_base_amount", 0) or 0)
-            for item in items
-            if getattr(item, "is_pph_applicable", 0)
-        )
         pph_base_total = item_pph_total or (
-            flt(getattr(self, "pph_base_amount", 0) or 0) if getattr(self, "is_pph_applicable", 0) else 0
+            flt(getattr(self, "pph_base_amount", 0) or 0) if header_pph else 0
         )
         pph_rate = _resolve_pph_rate(getattr(self, "pph_type", None))
         total_pph = (pph_base_total * pph_rate / 100) if pph_rate else pph_base_total
@@ -307,7 +337,7 @@ class ExpenseRequest(Document):
         total_amount = total_expense + total_ppn + total_ppnbm - total_pph
 
         # Keep header PPh base amount in sync with the effective base used for calculations.
-        if getattr(self, "is_pph_applicable", 0) or item_pph_total:
+        if header_pph or item_pph_total:
             self.pph_base_amount = pph_base_total
         else:
             self.pph_base_amount = 0
@@ -519,7 +549,6 @@ class ExpenseRequest(Document):
                 frappe.throw(_("Deferred Expense is disabled in settings."))
             return
 
-        valid_prepaid_accounts = sorted(deferrable_accounts)
         for item in self.get("items", []):
             if not getattr(item, "is_deferred_expense", 0):
                 continue
@@ -530,7 +559,7 @@ class ExpenseRequest(Document):
             if item.prepaid_account not in deferrable_accounts:
                 frappe.throw(
                     _("Prepaid Account {0} is not in deferrable accounts. Valid accounts: {1}").format(
-                        item.prepaid_account, ", ".join(valid_prepaid_accounts) or _("None")
+                        item.prepaid_account, ", ".join(sorted(deferrable_accounts)) or _("None")
                     )
                 )
 
@@ -545,7 +574,7 @@ class ExpenseRequest(Document):
                 flt(item.amount), periods, item.deferred_start_date
             )
             if not hasattr(item, "flags"):
-                item.flags = type("Flags", (), {})()
+                item.flags = frappe._dict()
             item.flags.deferred_amortization_schedule = schedule
 
     def _sync_tax_invoice_upload(self):
@@ -558,18 +587,25 @@ class ExpenseRequest(Document):
         if getattr(self, "docstatus", 0) != 1:
             return
 
-        if self.status not in ("Approved", "PI Created", "Paid"):
+        if self.status not in FINAL_STATUSES:
             return
 
         previous = self._get_previous_doc()
         if not previous:
             return
 
-        key_fields = ("request_type", "supplier", "amount", "cost_center", "branch", "project")
-        changed = [f for f in key_fields if self._get_value(previous, f) != getattr(self, f, None)]
-        
-        if changed:
-            frappe.throw(_("Cannot modify after approval: {0}").format(", ".join(changed)))
+        previous_values = self._get_final_state_key_values(previous)
+        current_values = self._get_final_state_key_values(self)
+        # Common case is no change: a single tuple comparison, names are only resolved to report.
+        if previous_values == current_values:
+            return
+
+        changed = [
+            field
+            for field, old, new in zip(_FINAL_STATE_KEY_FIELDS, previous_values, current_values)
+            if old != new
+        ]
+        frappe.throw(_("Cannot modify after approval: {0}").format(", ".join(changed)))
 
     # ===================== Approval Helpers =====================
 
@@ -591,26 +627,15 @@ class ExpenseRequest(Document):
 
     def _reset_status_if_copied(self):
         """Clear status when copying from submitted doc."""
-        if getattr(self, "docstatus", 0) == 0 and getattr(self, "status", None) in ("Rejected", "Approved"):
-            self.status = None
-            self.workflow_state = None
-            self.current_approval_level = 0
-            self.approved_on = None
-            self.rejected_on = None
-            self.approval_route_snapshot = None
-            self.level_1_user = None
-            self.level_2_user = None
-            self.level_3_user = None
+        if getattr(self, "docstatus", 0) == 0 and getattr(self, "status", None) in _COPY_RESET_STATUSES:
+            self.update(_RESET_COPY_FIELDS)
 
     def validate_submit_permission(self):
         """Best practice: only creator or Expense Approver/System Manager can submit."""
-        allowed_roles = {roles.SYSTEM_MANAGER, roles.EXPENSE_APPROVER}
-        current_roles = set(frappe.get_roles())
-
         if frappe.session.user == self.owner:
             return
 
-        if current_roles & allowed_roles:
+        if self._has_any_role(APPROVER_ROLES):
             return
 
         frappe.throw(_("Only the creator or an Expense Approver/System Manager can submit."))
@@ -642,9 +667,8 @@ class ExpenseRequest(Document):
 
     def apply_route(self, route: dict, *, setting_meta: dict | None = None) -> None:
         """Store approval route on document."""
-        self.level_1_user = route.get("level_1", {}).get("user")
-        self.level_2_user = route.get("level_2", {}).get("user")
-        self.level_3_user = route.get("level_3", {}).get("user")
+        for _level, level_key in ROUTE_LEVELS:
+            setattr(self, f"{level_key}_user", (route.get(level_key) or {}).get("user"))
         ApprovalRouteService.record_setting_meta(self, setting_meta)
 
     def record_approval_route_snapshot(self, route: dict | None = None) -> None:
@@ -700,7 +724,10 @@ class ExpenseRequest(Document):
             return parsed
         
         # Fallback: build from level_*_user fields
-        return {f"level_{l}": {"user": getattr(self, f"level_{l}_user", None)} for l in (1, 2, 3)}
+        return {
+            level_key: {"user": getattr(self, f"{level_key}_user", None)}
+            for _level, level_key in ROUTE_LEVELS
+        }
 
     def _has_approver(self, route: dict | None) -> bool:
         """Check if route has at least one approver."""
@@ -709,26 +736,50 @@ class ExpenseRequest(Document):
 
     # ===================== Utility =====================
 
+    def _current_roles(self) -> frozenset[str]:
+        """Return the session user's roles, fetched once per document instance."""
+        cache = get_doc_cache(self)
+        current_roles = cache.get("roles")
+        if current_roles is None:
+            current_roles = cache["roles"] = frozenset(frappe.get_roles())
+        return current_roles
+
+    def _has_any_role(self, allowed: frozenset[str]) -> bool:
+        """Check if the session user holds at least one of ``allowed``."""
+        return not allowed.isdisjoint(self._current_roles())
+
     def _get_company(self) -> str | None:
         cost_center = getattr(self, "cost_center", None)
         if cost_center:
-            return frappe.db.get_value("Cost Center", cost_center, "company")
+            return frappe.get_cached_value("Cost Center", cost_center, "company")
         return None
 
     def _get_expense_accounts(self) -> tuple[str, ...]:
         """Get expense accounts from items."""
         accounts = getattr(self, "expense_accounts", None)
-        if accounts:
-            return accounts
-
-        _, accounts = accounting.summarize_request_items(self.get("items"))
+        # An empty tuple is a valid summary and must not trigger a rescan; anything else
+        # (not summarised in this save yet, or a string assigned from outside) is rebuilt.
+        if not isinstance(accounts, tuple):
+            _, accounts = accounting.summarize_request_items(self.get("items"))
+            self.expense_accounts = accounts
         return accounts
 
+    @classmethod
+    def _get_final_state_key_values(cls, source) -> tuple:
+        """Read all final-state key fields from ``source`` in one attrgetter call."""
+        try:
+            return _FINAL_STATE_KEY_GETTER(source)
+        except AttributeError:
+            # dict-like snapshots or documents missing a field
+            getter = cls._make_getter(source)
+            return tuple(getter(field) for field in _FINAL_STATE_KEY_FIELDS)
+
     @staticmethod
-    def _get_value(source, field):
+    def _make_getter(source):
+        """Pick the field accessor for ``source`` once instead of per field."""
         if hasattr(source, "get"):
-            return source.get(field)
-        return getattr(source, field, None)
+            return source.get
+        return lambda field: getattr(source, field, None)
 
     def _get_previous_doc(self):
         previous = getattr(self, "_doc_before_save", None)
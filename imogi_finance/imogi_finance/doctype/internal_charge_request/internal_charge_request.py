@@ -76,7 +76,7 @@ class InternalChargeRequest(Document):
         """
         approvable_lines = []
         session_user = getattr(getattr(frappe, "session", None), "user", None)
-        session_roles = set(frappe.get_roles())
+        session_roles = None
 
         for line in getattr(self, "internal_charge_lines", []) or []:
             if getattr(line, "line_status", None) not in {"Pending L1", "Pending L2", "Pending L3"}:
@@ -90,11 +90,18 @@ class InternalChargeRequest(Document):
             expected_role = level_meta.get("role") or getattr(line, f"{level_key}_role", None)
             expected_user = level_meta.get("user") or getattr(line, f"{level_key}_approver", None)
 
-            role_allowed = not expected_role or expected_role in session_roles
             user_allowed = not expected_user or expected_user == session_user
-            
-            if role_allowed and user_allowed:
-                approvable_lines.append(line)
+            if not user_allowed:
+                continue
+
+            if expected_role:
+                # Roles are fetched once, and only when a line actually requires one.
+                if session_roles is None:
+                    session_roles = frozenset(frappe.get_roles())
+                if expected_role not in session_roles:
+                    continue
+
+            approvable_lines.append(line)
 
         if not approvable_lines:
             cost_centers = {getattr(line, "target_cost_center") for line in getattr(self, "internal_charge_lines", []) or []}
@@ -188,15 +195,23 @@ class InternalChargeRequest(Document):
         if not expense_accounts:
             return
 
+        # Lines often share a target cost center (and amount); resolve each once per call.
+        setting_cache: dict = {}
+        route_cache: dict = {}
         for line in getattr(self, "internal_charge_lines", []) or []:
             try:
-                setting_meta = get_active_setting_meta(line.target_cost_center)
-                route = get_approval_route(
-                    line.target_cost_center,
-                    expense_accounts,
-                    float(getattr(line, "amount", 0) or 0),
-                    setting_meta=setting_meta,
-                )
+                cost_center = line.target_cost_center
+                route_key = (cost_center, float(getattr(line, "amount", 0) or 0))
+                route = route_cache.get(route_key)
+                if route is None:
+                    if cost_center not in setting_cache:
+                        setting_cache[cost_center] = get_active_setting_meta(cost_center)
+                    route = route_cache[route_key] = get_approval_route(
+                        cost_center,
+                        expense_accounts,
+                        route_key[1],
+                        setting_meta=setting_cache[cost_center],
+                    )
             except (frappe.DoesNotExistError, frappe.ValidationError) as exc:
                 log_route_resolution_error(
                     exc,
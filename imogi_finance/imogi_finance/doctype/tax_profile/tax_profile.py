@@ -69,7 +69,7 @@ class TaxProfile(Document):
         if missing:
             self._safe_throw(
                 _("Please complete the following on the Tax Profile for {0}: {1}.").format(
-                    self.company or self.name, _(", ").join(missing)
+                    self.company or self.name, ", ".join(missing)
                 ),
                 title=_("Incomplete Tax Profile"),
             )
@@ -87,11 +87,17 @@ class TaxProfile(Document):
             if acct
         ]
 
-        duplicates = {acc for acc in accounts if accounts.count(acc) > 1}
+        # Single pass instead of list.count() per account.
+        seen: set[str] = set()
+        duplicates: set[str] = set()
+        for acc in accounts:
+            if acc in seen:
+                duplicates.add(acc)
+            seen.add(acc)
         if duplicates:
             self._safe_throw(
                 _("The same account is referenced multiple times: {0}. Please review the Tax Profile.").format(
-                    ", ".join(sorted(set(duplicates)))
+                    ", ".join(sorted(duplicates))
                 )
             )
     def _validate_pb1_mappings(self):
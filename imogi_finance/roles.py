@@ -12,7 +12,7 @@ RECEIPT_APPROVER = "Receipt Approver"
 RECEIPT_AUDITOR = "Receipt Auditor"
 TAX_REVIEWER = "Tax Reviewer"
 
-TAX_PRIVILEGED_ROLES = {SYSTEM_MANAGER, TAX_REVIEWER}
+TAX_PRIVILEGED_ROLES = frozenset({SYSTEM_MANAGER, TAX_REVIEWER})
 
 
 def session_roles() -> set[str]:
@@ -28,5 +28,6 @@ def session_roles() -> set[str]:
 
 def has_any_role(*roles: str) -> bool:
     """Check if the current session has any of the given roles."""
-    flattened = {role for role in roles if role}
-    return bool(session_roles() & flattened)
+    current_roles = session_roles()
+    # Callers pass a handful of roles: probe the session set directly and stop at the first hit.
+    return any(role in current_roles for role in roles if role)
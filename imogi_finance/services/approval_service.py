@@ -7,9 +7,14 @@ import frappe
 from frappe import _
 from frappe.utils import now_datetime
 
+from imogi_finance.approval import ROUTE_LEVELS
+
 if TYPE_CHECKING:
     from frappe.model.document import Document
 
+# Actions that require the session user to be the current level's approver.
+APPROVER_ACTIONS = frozenset({"Approve", "Reject"})
+
 
 class ApprovalService:
     """Handle multi-level approval state transitions following Frappe workflow conventions.
@@ -28,6 +33,7 @@ class ApprovalService:
         self.state_field = state_field
         self.status_field = "status"
         self.level_field_prefix = "level_{level}_user"
+        self.level_user_fields = tuple(self.level_field_prefix.format(level=level) for level, _key in ROUTE_LEVELS)
         self.current_level_field = "current_approval_level"
 
     def before_submit(
@@ -66,18 +72,16 @@ class ApprovalService:
             next_state: Target workflow state
             route: Approval route (loaded from doc if not provided)
         """
-        route = route or self._get_route_snapshot(doc)
-
-        # Submit action: set up initial state
+        # Submit action: set up initial state (before_submit resolves the route itself)
         if action == "Submit":
             self.before_submit(doc, route=route)
             return
 
-        # Approve/Reject: check authorization
-        if action in ("Approve", "Reject"):
+        # Approve/Reject: check authorization against the level fields; the route is not needed
+        if action in APPROVER_ACTIONS:
             if not self._is_pending_review(doc):
                 return
-            self._check_approver_authorization(doc, route)
+            self._check_approver_authorization(doc)
 
         # Set flag to allow status changes
         self._set_flags(doc, workflow_allowed=True)
@@ -154,9 +158,8 @@ class ApprovalService:
 
     # ===================== Private Helpers =====================
 
-    def _check_approver_authorization(self, doc: Document, route: dict | None = None) -> None:
+    def _check_approver_authorization(self, doc: Document) -> None:
         """Validate current user is the approver for current level."""
-        route = route or self._get_route_snapshot(doc)
         if not self._is_pending_review(doc):
             return
 
@@ -194,14 +197,14 @@ class ApprovalService:
             # Fallback for testing or edge cases
             if not route:
                 return False
-            return any(route.get(f"level_{level}", {}).get("user") for level in (1, 2, 3))
+            return any(route.get(level_key, {}).get("user") for _level, level_key in ROUTE_LEVELS)
 
     def _get_initial_level(self, route: dict | None) -> int:
         """Get first configured approval level."""
         if not route:
             return 1
-        for level in (1, 2, 3):
-            if route.get(f"level_{level}", {}).get("user"):
+        for level, level_key in ROUTE_LEVELS:
+            if route.get(level_key, {}).get("user"):
                 return level
         return 1
 
@@ -210,24 +213,22 @@ class ApprovalService:
         level = getattr(doc, self.current_level_field, None) or 0
         return int(level) if level else None
 
+    def _get_level_users(self, doc: Document) -> tuple:
+        """Read the level 1-3 approver fields in one pass."""
+        return tuple(doc.get(field) for field in self.level_user_fields)
+
     def _has_next_level(self, doc: Document) -> bool:
         """Check if there are more approval levels after current."""
         current = self._get_current_level(doc) or 1
-        for level in range(current + 1, 4):
-            user_field = self.level_field_prefix.format(level=level)
-            if doc.get(user_field):
-                return True
-        return False
+        # Level N lives at index N - 1, so levels after ``current`` start at index ``current``.
+        return any(self._get_level_users(doc)[current:])
 
     def _advance_level(self, doc: Document) -> None:
         """Move to next approval level."""
         current = self._get_current_level(doc) or 1
-        for level in range(current + 1, 4):
-            user_field = self.level_field_prefix.format(level=level)
-            if doc.get(user_field):
-                setattr(doc, self.current_level_field, level)
-                return
-        setattr(doc, self.current_level_field, current)
+        users = self._get_level_users(doc)
+        next_level = next((level for level in range(current + 1, 4) if users[level - 1]), current)
+        setattr(doc, self.current_level_field, next_level)
 
     def _set_state(self, doc: Document, state: str, level: int = 0) -> None:
         """Set workflow state and sync status field."""
@@ -240,7 +241,7 @@ class ApprovalService:
         """Set flags to allow status changes."""
         flags = getattr(doc, "flags", None)
         if flags is None:
-            flags = type("Flags", (), {})()
+            flags = frappe._dict()
             doc.flags = flags
         if workflow_allowed:
             flags.workflow_action_allowed = True
@@ -263,6 +264,6 @@ class ApprovalService:
 
         # Fallback: build from document fields
         return {
-            f"level_{level}": {"user": doc.get(self.level_field_prefix.format(level=level))}
-            for level in (1, 2, 3)
+            level_key: {"user": user}
+            for (_level, level_key), user in zip(ROUTE_LEVELS, self._get_level_users(doc))
         }
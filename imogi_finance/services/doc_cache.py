@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def get_doc_cache(doc: Any) -> dict:
+    """Per-instance memo for values a controller derives during one save or workflow action.
+
+    Stored in the instance ``__dict__`` so it never becomes a document field and is
+    dropped together with the instance.
+    """
+    return doc.__dict__.setdefault("_perf_cache", {})
@@ -54,6 +54,6 @@ class WorkflowService:
     def _mark_workflow_allowed(doc: Any):
         flags = getattr(doc, "flags", None)
         if flags is None:
-            flags = type("Flags", (), {})()
+            flags = frappe._dict()
             doc.flags = flags
         doc.flags.workflow_action_allowed = True
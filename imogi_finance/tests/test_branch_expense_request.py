@@ -185,3 +185,21 @@ def test_budget_warning_allows_submit(monkeypatch):
 
     # Should not raise because warn_only mode is on
     doc.before_submit()
+
+
+def test_level_skip_check_reads_current_level_fields():
+    frappe.throw = _throw
+    doc = branch_expense_request.BranchExpenseRequest()
+    doc.current_approval_level = 1
+    doc.level_1_user = "approver1@example.com"
+    doc.level_2_user = None
+    doc.level_3_user = None
+
+    doc.validate_not_skipping_levels("Approve", "Approved")
+    assert not doc.has_next_approval_level()
+
+    doc.level_2_user = "approver2@example.com"
+
+    assert doc.has_next_approval_level()
+    with pytest.raises(_Throw):
+        doc.validate_not_skipping_levels("Approve", "Approved")
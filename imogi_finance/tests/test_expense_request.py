@@ -102,7 +102,7 @@ frappe_model_document.Document = Document
 sys.modules["frappe.model"] = frappe_model
 sys.modules["frappe.model.document"] = frappe_model_document
 
-from imogi_finance.approval import get_approval_route  # noqa: E402
+from imogi_finance.approval import get_approval_route, validate_route_users  # noqa: E402
 from imogi_finance.imogi_finance.doctype.expense_approval_setting.expense_approval_setting import (  # noqa: E402
     ExpenseApprovalSetting,
 )
@@ -1407,3 +1407,35 @@ def test_approval_route_filters_levels_by_amount(monkeypatch):
     assert route_mid["level_1"]["user"] == "user1@example.com"
     assert route_mid["level_2"]["user"] == "user2@example.com"
     assert route_mid["level_3"]["user"] is None
+
+
+def test_validate_route_users_checks_all_levels_in_one_query_case_insensitively(monkeypatch):
+    calls = []
+
+    def _fake_get_all(doctype, filters=None, fields=None, **kwargs):
+        calls.append((doctype, sorted(filters["name"][1])))
+        return [
+            {"name": "active@example.com", "enabled": 1},
+            {"name": "disabled@example.com", "enabled": 0},
+        ]
+
+    monkeypatch.setattr(frappe, "get_all", _fake_get_all, raising=False)
+
+    result = validate_route_users(
+        {
+            "level_1": {"user": "Active@Example.com"},
+            "level_2": {"user": "disabled@example.com"},
+            "level_3": {"user": "missing@example.com"},
+        }
+    )
+
+    assert calls == [
+        ("User", ["Active@Example.com", "disabled@example.com", "missing@example.com"])
+    ]
+    assert result["valid"] is False
+    assert result["invalid_users"] == [
+        {"level": 3, "user": "missing@example.com", "reason": "not_found"}
+    ]
+    assert result["disabled_users"] == [
+        {"level": 2, "user": "disabled@example.com", "reason": "disabled"}
+    ]
@@ -7,6 +7,8 @@ import frappe
 from frappe import _
 from frappe.utils import flt
 
+_MISSING = object()
+
 
 def _safe_throw(message: str):
     marker = getattr(frappe, "ThrowMarker", None)
@@ -42,48 +44,65 @@ class FinanceValidator:
 
     @staticmethod
     def validate_amounts(items: Iterable[Any]) -> tuple[float, tuple[str, ...]]:
+        total, accounts, _pph_base_total = FinanceValidator.summarize_items(items)
+        return total, accounts
+
+    @staticmethod
+    def summarize_items(items: Iterable[Any]) -> tuple[float, tuple[str, ...], float]:
+        """Return item total, sorted expense accounts and PPh base total in one pass."""
         total = 0.0
-        accounts: list[str] = []
+        pph_base_total = 0.0
+        accounts: set[str] = set()
         for item in items or []:
-            qty = flt(getattr(item, "qty", 0)) or 0
-            rate = flt(getattr(item, "rate", 0)) or flt(getattr(item, "amount", 0))
-            amount = flt(getattr(item, "amount", qty * rate))
-            total += amount
+            # qty * rate is only the fallback for rows without an amount field.
+            amount = getattr(item, "amount", _MISSING)
+            if amount is _MISSING:
+                amount = (flt(getattr(item, "qty", 0)) or 0) * flt(getattr(item, "rate", 0))
+            total += flt(amount)
             account = getattr(item, "expense_account", None)
             if account:
-                accounts.append(account)
-        accounts_tuple = tuple(sorted({acc for acc in accounts if acc}))
-        return total, accounts_tuple
+                accounts.add(account)
+            if getattr(item, "is_pph_applicable", 0):
+                pph_base_total += flt(getattr(item, "pph_base_amount", 0) or 0)
+        return total, tuple(sorted(accounts)), pph_base_total
 
     @staticmethod
     def validate_tax_fields(doc):
         items = getattr(doc, "items", None) or []
 
-        is_ppn_applicable = getattr(doc, "is_ppn_applicable", 0)
-        if is_ppn_applicable and not getattr(doc, "ppn_template", None):
+        if getattr(doc, "is_ppn_applicable", 0) and not getattr(doc, "ppn_template", None):
             _safe_throw(_("Please select a PPN Template when PPN is applicable."))
 
-        item_pph_applicable = [item for item in items if getattr(item, "is_pph_applicable", 0)]
-        is_pph_applicable = getattr(doc, "is_pph_applicable", 0) or bool(item_pph_applicable)
-        if is_pph_applicable:
+        # Single pass: note whether any item carries PPh and remember the first one missing a base amount.
+        has_item_pph = False
+        invalid_pph_item = None
+        for item in items:
+            if not getattr(item, "is_pph_applicable", 0):
+                continue
+            has_item_pph = True
+            if invalid_pph_item is None:
+                base_amount = getattr(item, "pph_base_amount", None)
+                if not base_amount or base_amount <= 0:
+                    invalid_pph_item = item
+
+        header_pph = getattr(doc, "is_pph_applicable", 0)
+        if header_pph or has_item_pph:
             if not getattr(doc, "pph_type", None):
                 _safe_throw(_("Please select a PPh Type when PPh is applicable."))
 
-            if getattr(doc, "is_pph_applicable", 0) and not item_pph_applicable:
+            if header_pph and not has_item_pph:
                 base_amount = getattr(doc, "pph_base_amount", None)
                 if not base_amount or base_amount <= 0:
                     _safe_throw(_("Please enter a PPh Base Amount greater than zero when PPh is applicable."))
 
-            for item in item_pph_applicable:
-                base_amount = getattr(item, "pph_base_amount", None)
-                if not base_amount or base_amount <= 0:
-                    _safe_throw(
-                        _("Please enter a PPh Base Amount greater than zero for item {0}.").format(
-                            getattr(item, "description", None)
-                            or getattr(item, "expense_account", None)
-                            or getattr(item, "idx", None)
-                        )
+            if invalid_pph_item is not None:
+                _safe_throw(
+                    _("Please enter a PPh Base Amount greater than zero for item {0}.").format(
+                        getattr(invalid_pph_item, "description", None)
+                        or getattr(invalid_pph_item, "expense_account", None)
+                        or getattr(invalid_pph_item, "idx", None)
                     )
+                )
 
 
 def validate_document_tax_fields(doc, method=None):